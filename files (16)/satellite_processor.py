@@ -9,19 +9,39 @@ This script connects to Google Earth Engine to:
 4. Generate alerts for significant changes
 
 Prerequisites:
+- Python 3.10+
 - Google Earth Engine account (free): https://earthengine.google.com/
 - Run: earthengine authenticate
-- pip install earthengine-api geojson
+- pip install earthengine-api geojson numpy
+- Optional: pip install orjson (faster JSON export)
 
 Usage:
     python satellite_processor.py
 
 """
 
+import dbm
 import ee
+import functools
+import hashlib
+import heapq
 import json
-from datetime import datetime, timedelta
+import logging
+import numpy as np
+import shelve
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from operator import attrgetter
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
+
+logger = logging.getLogger(__name__)
 
 # ================================================
 # CONFIGURATION
@@ -44,9 +64,38 @@ NDVI_DECREASE_THRESHOLD = -0.15  # Significant vegetation loss
 NDVI_INCREASE_THRESHOLD = 0.10   # Recovery detected
 MIN_AREA_ACRES = 2               # Minimum area to report
 
+# Change classes used when vectorizing damage/recovery together
+DAMAGE_CLASS = 1
+RECOVERY_CLASS = 2
+
+# Unit conversion
+ACRES_PER_SQM = 0.000247105
+PIXEL_AREA_SQM = 30 * 30         # Area of one 30m analysis pixel
+
+# Projection for vectorizing change areas (UTM zone 15N covers Red Lake)
+VECTOR_CRS = 'EPSG:32615'
+
+# Earth Engine high-volume endpoint (for automated, non-interactive runs)
+EE_HIGH_VOLUME_URL = 'https://earthengine-highvolume.googleapis.com'
+
+# HTTP connection pool size for Earth Engine requests
+EE_HTTP_POOL_SIZE = 20
+
+# Cloud Storage bucket for exported map layers
+EXPORT_BUCKET = 'red-lake-forest-watch'
+
 # Output directory
 OUTPUT_DIR = Path('./output')
 
+# Opt-in baseline caching (detect_changes(baseline_snap_days=...)):
+# windows snap to a fixed grid so scheduled runs share them; each is
+# exported once to an EE asset. Pending exports are tracked on disk
+BASELINE_SNAP_DAYS = 15          # Suggested grid for scheduled runs
+BASELINE_ASSET_ROOT = 'projects/red-lake-forest-watch/assets'
+BASELINE_CACHE = OUTPUT_DIR / 'cache' / 'baseline_composites'
+BASELINE_CACHE_SIZE = 4          # Baseline windows (and assets) to keep
+BASELINE_EXPORT_ATTEMPTS = 3     # Export attempts per window before giving up
+
 # Default boundary file
 DEFAULT_BOUNDARY = Path('./red_lake_boundary.geojson')
 
@@ -55,23 +104,73 @@ DEFAULT_BOUNDARY = Path('./red_lake_boundary.geojson')
 # INITIALIZE EARTH ENGINE
 # ================================================
 
+def _configure_http_pool():
+    """
+    Enlarge the connection pool of Earth Engine's shared requests.Session.
+    
+    Keeps TLS connections warm across the many small RPCs of a run.
+    Retries of 429/5xx responses (with backoff) are left to the ee client.
+    Does nothing on client versions that don't expose a shared session.
+    """
+    # ee keeps its session in private state; look it up defensively
+    get_state = getattr(ee.data, '_get_state', None)
+    state = get_state() if callable(get_state) else None
+    session = getattr(state, 'requests_session', None)
+    
+    if session is None:
+        logger.debug("Earth Engine client has no shared requests session - using default pool")
+        return
+    
+    adapter = HTTPAdapter(pool_connections=EE_HTTP_POOL_SIZE, pool_maxsize=EE_HTTP_POOL_SIZE)
+    session.mount('https://', adapter)
+
+
 def initialize_ee():
-    """Initialize Google Earth Engine connection."""
+    """
+    Initialize Google Earth Engine connection.
+    
+    Uses the high-volume endpoint, which allows far more concurrent
+    requests than the default one. The tradeoff is that it is meant for
+    automated workloads: results are cached less aggressively and it is
+    not suited to interactive debugging - use the default endpoint
+    (ee.Initialize without url) when exploring data by hand.
+    """
     try:
-        ee.Initialize(project='red-lake-forest-watch')
-        print("✓ Connected to Google Earth Engine")
-        return True
+        ee.Initialize(project='red-lake-forest-watch', url=EE_HIGH_VOLUME_URL)
     except Exception as e:
-        print(f"✗ Earth Engine authentication required")
-        print(f"  Run: earthengine authenticate")
-        print(f"  Error: {e}")
+        logger.error("✗ Earth Engine authentication required")
+        logger.error("  Run: earthengine authenticate")
+        logger.error("  Error: %s", e)
         return False
+    
+    # Pool tuning is an optimization - never fail initialization over it
+    try:
+        _configure_http_pool()
+    except Exception as e:
+        logger.warning("⚠ Could not tune Earth Engine HTTP pool: %s", e)
+    
+    logger.info("✓ Connected to Google Earth Engine")
+    return True
 
 
 # ================================================
 # BOUNDARY LOADING
 # ================================================
 
+@functools.lru_cache(maxsize=8)
+def _load_boundary_geometry(path, mtime_ns):
+    """
+    Parse a boundary GeoJSON file into an ee.Geometry.
+    
+    Cached per (path, mtime) so repeated runs in one process neither
+    re-read the file nor rebuild the geometry; editing the file changes
+    mtime_ns and forces a reload.
+    """
+    data = Path(path).read_bytes()
+    geojson = orjson.loads(data) if orjson is not None else json.loads(data)
+    return ee.Geometry(geojson['features'][0]['geometry'])
+
+
 def load_reservation_boundary(geojson_path=None):
     """
     Load Red Lake Reservation boundary.
@@ -84,12 +183,11 @@ def load_reservation_boundary(geojson_path=None):
         ee.Geometry object
     """
     if geojson_path and Path(geojson_path).exists():
-        with open(geojson_path) as f:
-            geojson = json.load(f)
-        return ee.Geometry(geojson['features'][0]['geometry'])
+        path = Path(geojson_path).resolve()
+        return _load_boundary_geometry(str(path), path.stat().st_mtime_ns)
     else:
         # Use bounding box as fallback
-        print("⚠ Using bounding box approximation - load actual boundary for accuracy")
+        logger.warning("⚠ Using bounding box approximation - load actual boundary for accuracy")
         return ee.Geometry.Rectangle([
             RED_LAKE_BOUNDS['west'],
             RED_LAKE_BOUNDS['south'],
@@ -102,7 +200,20 @@ def load_reservation_boundary(geojson_path=None):
 # SENTINEL-2 DATA RETRIEVAL
 # ================================================
 
-def get_sentinel2_image(region, start_date, end_date, cloud_max=20):
+def _base_collection(region, cloud_max=20):
+    """
+    Sentinel-2 collection filtered by region and cloud cover only.
+    
+    Shared by the baseline and current composites, which differ only
+    in their date range.
+    """
+    return (ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED')
+        .filterBounds(region)
+        .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', cloud_max))
+    )
+
+
+def get_sentinel2_image(region, start_date, end_date, cloud_max=20, base_collection=None, index='NDVI'):
     """
     Get cloud-free Sentinel-2 composite for a date range.
     
@@ -111,25 +222,40 @@ def get_sentinel2_image(region, start_date, end_date, cloud_max=20):
         start_date: Start date string 'YYYY-MM-DD'
         end_date: End date string 'YYYY-MM-DD'  
         cloud_max: Maximum cloud cover percentage
+        base_collection: Pre-filtered collection from _base_collection()
+                         If None, one is built from region and cloud_max
+        index: Spectral index computed per image before compositing
+               ('NDVI' or 'NBR'); None returns the raw band composite
     
     Returns:
-        ee.Image - median composite
+        ee.Image - median composite, null server-side if no images matched
+        (checked later in a single round-trip, see _image_count)
     """
-    collection = (ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED')
-        .filterBounds(region)
-        .filterDate(start_date, end_date)
-        .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', cloud_max))
-    )
+    if base_collection is None:
+        base_collection = _base_collection(region, cloud_max)
     
-    # Get image count
-    count = collection.size().getInfo()
-    print(f"  Found {count} Sentinel-2 images for {start_date} to {end_date}")
+    collection = base_collection.filterDate(start_date, end_date)
     
-    if count == 0:
-        return None
+    # Median of per-image index values (not the index of median bands)
+    if index is not None:
+        collection = collection.map(SPECTRAL_INDICES[index])
+    
+    # Median composite (reduces cloud effects), guarded server-side so no
+    # blocking count request is needed here. Not clipped: downstream
+    # reducers are already scoped with geometry=region
+    count = collection.size()
+    composite = collection.median().set('image_count', count)
+    
+    return ee.Image(ee.Algorithms.If(count.gt(0), composite, None))
+
+
+def _image_count(image):
+    """
+    Server-side image count for a composite from get_sentinel2_image().
     
-    # Return median composite (reduces cloud effects)
-    return collection.median().clip(region)
+    Evaluates to 0 when the composite is null (no matching images).
+    """
+    return ee.Algorithms.If(image, image.get('image_count'), 0)
 
 
 def calculate_ndvi(image):
@@ -165,18 +291,210 @@ def calculate_nbr(image):
     return nbr
 
 
+# Index name -> per-image function, for get_sentinel2_image(index=...)
+SPECTRAL_INDICES = {
+    'NDVI': calculate_ndvi,
+    'NBR': calculate_nbr
+}
+
+
+# ================================================
+# BASELINE CACHE
+# ================================================
+
+def _baseline_cache_key(region, start_date, end_date, cloud_max=20, index='NDVI'):
+    """
+    Cache key for a baseline composite.
+    
+    Built from the serialized region expression, so no EE round-trip
+    is needed to compute it.
+    """
+    signature = f"{region.serialize()}:{start_date}:{end_date}:{cloud_max}:{index}"
+    return hashlib.blake2b(signature.encode(), digest_size=16).hexdigest()
+
+
+def _baseline_asset_id(key, baseline_end):
+    """Deterministic asset ID for a baseline window, shared by every host."""
+    return f"{BASELINE_ASSET_ROOT}/baseline_ndvi_{baseline_end.replace('-', '')}_{key[:8]}"
+
+
+def _get_baseline_asset(asset_id):
+    """Return the asset's metadata, or None if it is missing or unreachable."""
+    try:
+        return ee.data.getInfo(asset_id)
+    except Exception as e:
+        logger.warning("⚠ Could not look up baseline asset %s: %s", asset_id, e)
+        return None
+
+
+def _read_baseline_cache(key):
+    """Return the pending-export entry for key, or None (read-only, creates nothing)."""
+    try:
+        with shelve.open(str(BASELINE_CACHE), flag='r') as cache:
+            return cache.get(key)
+    except dbm.error:
+        # No cache written yet
+        return None
+
+
+def _write_baseline_cache(key, entry):
+    """
+    Store a pending-export entry.
+    
+    Only the BASELINE_CACHE_SIZE most recent baseline windows are kept.
+    Failures are logged - the cache is an optimization, never required.
+    """
+    try:
+        BASELINE_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        with shelve.open(str(BASELINE_CACHE)) as cache:
+            cache[key] = entry
+            by_age = sorted(cache.keys(), key=lambda k: cache[k]['baseline_end'], reverse=True)
+            for stale_key in by_age[BASELINE_CACHE_SIZE:]:
+                del cache[stale_key]
+    except dbm.error as e:  # (dbm.error, OSError)
+        logger.warning("⚠ Could not write baseline cache: %s", e)
+
+
+def _delete_baseline_asset(asset_id):
+    """Delete an evicted baseline asset, logging (not raising) on failure."""
+    try:
+        ee.data.deleteAsset(asset_id)
+    except Exception as e:
+        logger.warning("⚠ Could not delete baseline asset %s: %s", asset_id, e)
+
+
+def _evict_baseline_assets():
+    """
+    Delete all but the BASELINE_CACHE_SIZE newest baseline assets.
+    
+    Driven by the asset listing rather than the local cache, so it also
+    cleans up after hosts whose cache did not persist (cron containers).
+    """
+    try:
+        listing = ee.data.listAssets({'parent': BASELINE_ASSET_ROOT})
+    except Exception as e:
+        logger.warning("⚠ Could not list baseline assets: %s", e)
+        return
+    
+    prefix = f"{BASELINE_ASSET_ROOT}/baseline_ndvi_"
+    asset_ids = [a['id'] for a in listing.get('assets', []) if a.get('id', '').startswith(prefix)]
+    
+    # IDs are <prefix><YYYYMMDD>_<key>, so they sort by baseline date
+    asset_ids.sort(reverse=True)
+    for asset_id in asset_ids[BASELINE_CACHE_SIZE:]:
+        _delete_baseline_asset(asset_id)
+
+
+def _export_state(entry):
+    """Task state of a recorded export, or None if it cannot be checked."""
+    try:
+        return ee.data.getTaskStatus(entry['task_id'])[0]['state']
+    except Exception as e:
+        logger.warning("⚠ Could not check baseline export %s: %s", entry['asset_id'], e)
+        return None
+
+
+def _ensure_baseline_export(key, asset_id, image, baseline_end, region):
+    """
+    Export a baseline composite to asset_id unless an export is pending.
+    
+    Called only when the asset does not exist. A finished export whose
+    asset is missing (failed, cancelled, or deleted elsewhere) is retried
+    up to BASELINE_EXPORT_ATTEMPTS times per window.
+    """
+    entry = _read_baseline_cache(key)
+    attempts = 1
+    
+    if entry is not None:
+        state = _export_state(entry)
+        if state in (None, 'READY', 'RUNNING'):
+            # Still pending (or unknown) - don't start a duplicate
+            return
+        if entry['attempts'] >= BASELINE_EXPORT_ATTEMPTS:
+            logger.warning("⚠ Baseline export %s gave up after %d attempts (last: %s)",
+                           asset_id, entry['attempts'], state.lower())
+            return
+        attempts = entry['attempts'] + 1
+    
+    # 30m in VECTOR_CRS matches the analysis grid closely but not exactly
+    # (see detect_changes); hits and misses may differ at patch edges
+    try:
+        task = ee.batch.Export.image.toAsset(
+            image=image,
+            description=asset_id.rsplit('/', 1)[-1],
+            assetId=asset_id,
+            region=region,
+            crs=VECTOR_CRS,
+            scale=30,
+            maxPixels=1e10
+        )
+        task.start()
+    except Exception as e:
+        # Caching is optional - carry on with the in-memory composite
+        logger.warning("⚠ Could not start baseline export to %s: %s", asset_id, e)
+        return
+    
+    logger.info("  Started baseline export to %s (task %s, attempt %d)", asset_id, task.id, attempts)
+    _write_baseline_cache(key, {
+        'asset_id': asset_id,
+        'task_id': task.id,
+        'baseline_end': baseline_end,
+        'attempts': attempts
+    })
+    _evict_baseline_assets()
+
+
+# ================================================
+# ALERTS
+# ================================================
+
+@dataclass(frozen=True, slots=True)
+class Alert:
+    """A single change alert, serialized as one entry of alerts.json."""
+    id: str
+    type: str
+    severity: str       # 'high', 'medium' or 'positive' (recovery)
+    lat: float
+    lng: float
+    area_acres: float
+    date: str
+    description: str
+
+
 # ================================================
 # CHANGE DETECTION
 # ================================================
 
-def detect_changes(region, current_date=None, lookback_days=30):
+def detect_changes(region, current_date=None, lookback_days=30, baseline_snap_days=None):
     """
     Detect forest changes by comparing current imagery to baseline.
     
+    By default the baseline window ends exactly lookback_days before
+    current_date and is computed fresh. Passing baseline_snap_days (e.g.
+    BASELINE_SNAP_DAYS) opts into baseline caching: the baseline end is
+    snapped back to that fixed day grid, so it ends lookback_days to
+    lookback_days + baseline_snap_days - 1 days back and consecutive runs
+    share it. Each snapped baseline composite is exported once to an Earth
+    Engine asset with a deterministic ID; once that asset exists, later
+    runs (on any host) read it instead of recomputing the median. The
+    local BASELINE_CACHE only tracks pending exports and retry counts, so
+    on hosts where it doesn't persist a pending export may be started
+    twice, but reuse and eviction (by asset listing) still work.
+    
+    Cached and freshly computed baselines are not bit-identical: the
+    asset stores the composite resampled to 30m in VECTOR_CRS (with mean
+    pyramiding), while a fresh composite is evaluated from the native
+    10-20m bands at whatever scale each reducer requests. Masks and alert
+    areas can therefore differ slightly at patch edges between a run that
+    hits the cache and one that misses it.
+    
     Args:
         region: ee.Geometry defining area of interest
         current_date: Date to analyze (default: today)
         lookback_days: Days to look back for comparison
+        baseline_snap_days: Snap the baseline to a grid of this many days
+                            and cache it as an asset (None = exact window,
+                            no caching)
     
     Returns:
         dict with change analysis results
@@ -186,32 +504,63 @@ def detect_changes(region, current_date=None, lookback_days=30):
     elif isinstance(current_date, str):
         current_date = datetime.strptime(current_date, '%Y-%m-%d')
     
-    # Date ranges
-    current_start = (current_date - timedelta(days=15)).strftime('%Y-%m-%d')
-    current_end = current_date.strftime('%Y-%m-%d')
-    
-    baseline_end = (current_date - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
-    baseline_start = (current_date - timedelta(days=lookback_days + 15)).strftime('%Y-%m-%d')
-    
-    print(f"\nAnalyzing changes:")
-    print(f"  Baseline: {baseline_start} to {baseline_end}")
-    print(f"  Current:  {current_start} to {current_end}")
-    
-    # Get images
-    print("\nFetching baseline imagery...")
-    baseline_image = get_sentinel2_image(region, baseline_start, baseline_end)
-    
-    print("Fetching current imagery...")
-    current_image = get_sentinel2_image(region, current_start, current_end)
+    # Date ranges, as day offsets back from current_date
+    today = current_date.toordinal()
+    current_end, current_start = (
+        date.fromordinal(today - days).isoformat() for days in (0, 15)
+    )
+    baseline_day = today - lookback_days
+    if baseline_snap_days:
+        baseline_day = baseline_day // baseline_snap_days * baseline_snap_days
+    baseline_end, baseline_start = (
+        date.fromordinal(baseline_day - days).isoformat() for days in (0, 15)
+    )
     
-    if baseline_image is None or current_image is None:
-        print("✗ Insufficient imagery available")
+    logger.info("Analyzing changes:")
+    logger.info("  Baseline: %s to %s", baseline_start, baseline_end)
+    logger.info("  Current:  %s to %s", current_start, current_end)
+    
+    # Get NDVI composites (lazy - nothing is computed yet)
+    logger.info("Fetching imagery...")
+    base = _base_collection(region)
+    current_ndvi = get_sentinel2_image(region, current_start, current_end, base_collection=base)
+    
+    # A snapped baseline window is shared by several runs, so reuse its
+    # exported asset. The asset itself is the source of truth: it is
+    # looked up on every run, so deleted assets are recomputed and
+    # re-exported
+    asset = None
+    if baseline_snap_days:
+        cache_key = _baseline_cache_key(region, baseline_start, baseline_end)
+        asset_id = _baseline_asset_id(cache_key, baseline_end)
+        asset = _get_baseline_asset(asset_id)
+    
+    if asset is not None:
+        # Precomputed composite - skips rebuilding the baseline median.
+        # Assets are only exported for windows that had imagery
+        baseline_ndvi = ee.Image(asset_id)
+        current_count = _image_count(current_ndvi).getInfo()
+        baseline_count = asset.get('properties', {}).get('image_count', 1)
+        logger.info("  Using cached baseline composite %s", asset_id)
+    else:
+        baseline_ndvi = get_sentinel2_image(region, baseline_start, baseline_end, base_collection=base)
+        
+        # Check both periods have imagery in one round-trip
+        baseline_count, current_count = ee.List([
+            _image_count(baseline_ndvi),
+            _image_count(current_ndvi)
+        ]).getInfo()
+        
+        if baseline_snap_days and baseline_count > 0:
+            _ensure_baseline_export(cache_key, asset_id, baseline_ndvi, baseline_end, region)
+    
+    logger.info("  Found %d Sentinel-2 images for %s to %s", baseline_count, baseline_start, baseline_end)
+    logger.info("  Found %d Sentinel-2 images for %s to %s", current_count, current_start, current_end)
+    
+    if baseline_count == 0 or current_count == 0:
+        logger.error("✗ Insufficient imagery available")
         return None
     
-    # Calculate NDVI for both periods
-    baseline_ndvi = calculate_ndvi(baseline_image)
-    current_ndvi = calculate_ndvi(current_image)
-    
     # Calculate change
     ndvi_change = current_ndvi.subtract(baseline_ndvi).rename('NDVI_change')
     
@@ -232,81 +581,165 @@ def detect_changes(region, current_date=None, lookback_days=30):
     }
 
 
-def extract_change_areas(change_results, region):
+def _attach_area_and_centroid(vectors):
+    """
+    Attach area and centroid to each change polygon server-side.
+    
+    Features below MIN_AREA_ACRES are dropped before leaving Earth Engine,
+    so a single getInfo() returns everything needed to build alerts.
+    Centroids are only computed for the survivors, and polygon geometry
+    is stripped since alerts only need the properties.
+    
+    Args:
+        vectors: ee.FeatureCollection from reduceToVectors()
+    
+    Returns:
+        ee.FeatureCollection of geometry-less features with the original
+        properties plus 'area_sqm' and 'centroid'
+    """
+    def attach_area(feature):
+        return feature.set('area_sqm', feature.geometry().area(30))
+    
+    def attach_centroid(feature):
+        return ee.Feature(None, feature.toDictionary()).set(
+            'centroid', feature.geometry().centroid(30).coordinates()
+        )
+    
+    return (vectors
+        .map(attach_area)
+        .filter(ee.Filter.gte('area_sqm', MIN_AREA_ACRES / ACRES_PER_SQM))
+        .map(attach_centroid)
+    )
+
+
+def _coarsen_mask(mask, scale):
+    """
+    Resample a 30m change mask to a coarser vectorization grid.
+    
+    A coarse pixel is set when at least half of the 30m pixels inside it
+    are set, which keeps areas of MIN_AREA_ACRES-sized features close to
+    their native-resolution estimate.
+    """
+    return (mask
+        .setDefaultProjection(crs=VECTOR_CRS, scale=30)
+        .reduceResolution(reducer=ee.Reducer.mean(), maxPixels=1024)
+        .reproject(crs=VECTOR_CRS, scale=scale)
+        .gte(0.5)
+    )
+
+
+def extract_change_areas(change_results, region, vector_scale=60):
     """
     Extract discrete change areas as potential alerts.
     
+    Damage and recovery masks are combined into one categorical image
+    so both are polygonized by a single reduceToVectors() call. Masks
+    with too few changed pixels to reach MIN_AREA_ACRES are skipped, and
+    sub-threshold patches are masked out before vectorizing.
+    
     Args:
         change_results: Output from detect_changes()
         region: ee.Geometry
+        vector_scale: Resolution in meters to vectorize at (30 = native)
     
     Returns:
-        list of alert dictionaries
+        list of Alert objects
     """
     alerts = []
     
-    # Convert damage mask to vectors
-    damage_vectors = change_results['damage_mask'].selfMask().reduceToVectors(
-        geometry=region,
-        scale=30,  # 30m resolution
-        maxPixels=1e8,
-        geometryType='polygon'
-    )
-    
-    # Process each damage area
-    damage_features = damage_vectors.getInfo()
-    
-    if damage_features and 'features' in damage_features:
-        for i, feature in enumerate(damage_features['features']):
-            # Calculate area
-            geom = ee.Geometry(feature['geometry'])
-            area_sqm = geom.area().getInfo()
-            area_acres = area_sqm * 0.000247105
-            
-            if area_acres >= MIN_AREA_ACRES:
-                # Get centroid for alert location
-                centroid = geom.centroid().coordinates().getInfo()
-                
-                alerts.append({
-                    'id': f"damage_{i+1}",
-                    'type': 'vegetation_change',
-                    'severity': 'high' if area_acres > 20 else 'medium',
-                    'lat': centroid[1],
-                    'lng': centroid[0],
-                    'area_acres': round(area_acres, 1),
-                    'date': change_results['current_date'],
-                    'description': f"Significant vegetation loss detected ({round(area_acres, 1)} acres)"
-                })
-    
-    # Process recovery areas similarly
-    recovery_vectors = change_results['recovery_mask'].selfMask().reduceToVectors(
+    # Cheap pixel count first - skip polygonizing masks that cannot
+    # contain an area of MIN_AREA_ACRES (common on quiet weeks)
+    pixel_counts = ee.Image.cat([
+        change_results['damage_mask'].rename('damage'),
+        change_results['recovery_mask'].rename('recovery')
+    ]).reduceRegion(
+        reducer=ee.Reducer.sum(),
         geometry=region,
         scale=30,
+        maxPixels=1e8
+    ).getInfo()
+    
+    min_area_sqm = MIN_AREA_ACRES / ACRES_PER_SQM
+    has_damage = (pixel_counts.get('damage') or 0) * PIXEL_AREA_SQM >= min_area_sqm
+    has_recovery = (pixel_counts.get('recovery') or 0) * PIXEL_AREA_SQM >= min_area_sqm
+    
+    if not has_damage and not has_recovery:
+        return alerts
+    
+    # 1 = damage, 2 = recovery, on the (coarser) vectorization grid
+    classified = ee.Image(0)
+    if has_damage:
+        classified = classified.where(_coarsen_mask(change_results['damage_mask'], vector_scale), DAMAGE_CLASS)
+    if has_recovery:
+        classified = classified.where(_coarsen_mask(change_results['recovery_mask'], vector_scale), RECOVERY_CLASS)
+    classified = classified.selfMask().rename('class').toByte()
+    
+    # Drop connected patches smaller than MIN_AREA_ACRES before
+    # polygonizing, so speckle never becomes a feature
+    min_pixels = min_area_sqm / (vector_scale * vector_scale)
+    patch_size = classified.connectedPixelCount(maxSize=1024, eightConnected=True)
+    classified = classified.updateMask(patch_size.gte(min_pixels))
+    
+    # Convert both masks to vectors in one pass
+    change_vectors = classified.reduceToVectors(
+        geometry=region,
+        crs=VECTOR_CRS,
+        scale=vector_scale,
         maxPixels=1e8,
-        geometryType='polygon'
+        geometryType='polygon',
+        reducer=ee.Reducer.countEvery(),
+        labelProperty='class'
     )
     
-    recovery_features = recovery_vectors.getInfo()
-    
-    if recovery_features and 'features' in recovery_features:
-        for i, feature in enumerate(recovery_features['features']):
-            geom = ee.Geometry(feature['geometry'])
-            area_sqm = geom.area().getInfo()
-            area_acres = area_sqm * 0.000247105
-            
-            if area_acres >= MIN_AREA_ACRES:
-                centroid = geom.centroid().coordinates().getInfo()
-                
-                alerts.append({
-                    'id': f"recovery_{i+1}",
-                    'type': 'recovery',
-                    'severity': 'positive',
-                    'lat': centroid[1],
-                    'lng': centroid[0],
-                    'area_acres': round(area_acres, 1),
-                    'date': change_results['current_date'],
-                    'description': f"Vegetation recovery observed ({round(area_acres, 1)} acres)"
-                })
+    # Area/centroid computed and sub-threshold features dropped server-side,
+    # one round-trip for all features (MIN_AREA_ACRES re-checked below)
+    change_features = _attach_area_and_centroid(change_vectors).getInfo()
+    
+    if not change_features or not change_features.get('features'):
+        return alerts
+    
+    # Pull properties into arrays once, then work on whole columns
+    props = [feature['properties'] for feature in change_features['features']]
+    classes = np.fromiter((p['class'] for p in props), dtype=np.int64, count=len(props))
+    areas_acres = np.fromiter((p['area_sqm'] for p in props), dtype=np.float64, count=len(props)) * ACRES_PER_SQM
+    centroids = np.array([p['centroid'] for p in props], dtype=np.float64)
+    
+    keep = areas_acres >= MIN_AREA_ACRES
+    damage_idx = np.flatnonzero(keep & (classes == DAMAGE_CLASS)).tolist()
+    recovery_idx = np.flatnonzero(keep & (classes == RECOVERY_CLASS)).tolist()
+    
+    # Plain Python values so the alerts stay JSON-serializable
+    severity = np.where(areas_acres > 20, 'high', 'medium').tolist()
+    acres = np.round(areas_acres, 1).tolist()
+    lngs = centroids[:, 0].tolist()
+    lats = centroids[:, 1].tolist()
+    alert_date = change_results['current_date']
+    
+    alerts.extend(Alert(
+        id=f"damage_{n}",
+        type='vegetation_change',
+        severity=severity[i],
+        lat=lats[i],
+        lng=lngs[i],
+        area_acres=acres[i],
+        date=alert_date,
+        description=f"Significant vegetation loss detected ({acres[i]} acres)"
+    ) for n, i in enumerate(damage_idx, start=1))
+    
+    alerts.extend(Alert(
+        id=f"recovery_{n}",
+        type='recovery',
+        severity='positive',
+        lat=lats[i],
+        lng=lngs[i],
+        area_acres=acres[i],
+        date=alert_date,
+        description=f"Vegetation recovery observed ({acres[i]} acres)"
+    ) for n, i in enumerate(recovery_idx, start=1))
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        for alert in alerts:
+            logger.debug("  %s: %s acres at (%.4f, %.4f)", alert.id, alert.area_acres, alert.lat, alert.lng)
     
     return alerts
 
@@ -316,76 +749,124 @@ def extract_change_areas(change_results, region):
 # ================================================
 
 def export_alerts_json(alerts, output_path):
-    """Export alerts to JSON file for web app consumption."""
+    """
+    Export alerts to JSON file for web app consumption.
+    
+    Alert dataclasses are converted to plain JSON objects here, at write
+    time (natively by orjson, via asdict() for stdlib json).
+    """
     output = {
         'generated': datetime.now().isoformat(),
         'count': len(alerts),
         'alerts': alerts
     }
     
-    with open(output_path, 'w') as f:
-        json.dump(output, f, indent=2)
+    if orjson is not None:
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(output_path, 'w') as f:
+            json.dump(output, f, indent=2, default=asdict)
     
-    print(f"✓ Exported {len(alerts)} alerts to {output_path}")
+    logger.info("✓ Exported %d alerts to %s", len(alerts), output_path)
 
 
-def export_ndvi_tiles(ndvi_image, region, output_name):
+def export_ndvi_tiles(ndvi_image, region, output_name, bucket=EXPORT_BUCKET, scale=30):
     """
-    Export NDVI as map tiles for visualization.
+    Export NDVI as a pre-rendered cloud-optimized GeoTIFF for visualization.
+    
+    Starts an Earth Engine export of the colorized NDVI to Cloud Storage.
+    The resulting COG is rendered once and can be served from a static
+    CDN or a COG tile server (e.g. titiler) for Leaflet, rather than
+    having every pan/zoom hit Earth Engine's on-demand tile server.
+    
+    Note: this used to return a Leaflet {z}/{x}/{y} tile URL from
+    getMapId(). The URL returned now points at a single GeoTIFF, which
+    L.tileLayer cannot use directly - put a COG tile server in front of
+    it, or load it client-side (e.g. georaster-layer-for-leaflet).
     
-    Note: For production, you'd use Earth Engine's getMapId() 
-    to generate tile URLs for direct use in Leaflet.
+    The URL assumes that:
+    - the bucket is publicly readable (otherwise use gs://bucket/... with
+      authenticated access), and
+    - the export fits in one file. Earth Engine splits large exports into
+      tiles named <output_name>-0000000000-0000000000.tif etc.; raise
+      scale or export a smaller region if that happens.
+    
+    Args:
+        ndvi_image: ee.Image with NDVI band
+        region: ee.Geometry to export
+        output_name: Export task description and file name prefix
+        bucket: Cloud Storage bucket to write to
+        scale: Export resolution in meters
+    
+    Returns:
+        (task, cog_url) - the started ee.batch.Task (poll task.status()
+        for completion) and the public URL the COG will have once the
+        task state is COMPLETED
     """
-    # Get tile URL for Leaflet
     vis_params = {
         'min': -0.2,
         'max': 0.8,
         'palette': ['red', 'yellow', 'green', 'darkgreen']
     }
     
-    map_id = ndvi_image.getMapId(vis_params)
-    tile_url = map_id['tile_fetcher'].url_format
+    # Composites are unclipped, so clip here for display only
+    rendered = ndvi_image.clip(region).visualize(**vis_params)
+    
+    task = ee.batch.Export.image.toCloudStorage(
+        image=rendered,
+        description=output_name,
+        bucket=bucket,
+        fileNamePrefix=output_name,
+        region=region,
+        scale=scale,
+        maxPixels=1e10,
+        fileFormat='GeoTIFF',
+        formatOptions={'cloudOptimized': True}
+    )
+    task.start()
     
-    print(f"✓ NDVI tile URL: {tile_url}")
-    return tile_url
+    cog_url = f"https://storage.googleapis.com/{bucket}/{output_name}.tif"
+    logger.info("✓ Started NDVI COG export (task %s): %s", task.id, cog_url)
+    return task, cog_url
 
 
 # ================================================
 # MAIN PROCESSING PIPELINE
 # ================================================
 
-def run_analysis(boundary_file=None):
+def run_analysis(boundary_file=None, baseline_snap_days=None):
     """
     Run full forest change analysis for Red Lake Reservation.
     
     Args:
         boundary_file: Path to GeoJSON with reservation boundary
+        baseline_snap_days: Opt into snapped, cached baselines
+                            (see detect_changes)
     """
-    print("=" * 50)
-    print("RED LAKE FOREST WATCH - Satellite Analysis")
-    print("=" * 50)
+    logger.info("RED LAKE FOREST WATCH - Satellite Analysis")
     
     # Initialize Earth Engine
     if not initialize_ee():
         return
     
     # Load boundary
-    print("\nLoading reservation boundary...")
+    logger.info("Loading reservation boundary...")
     region = load_reservation_boundary(boundary_file)
     
     # Run change detection
-    print("\nRunning change detection...")
-    changes = detect_changes(region)
+    logger.info("Running change detection...")
+    changes = detect_changes(region, baseline_snap_days=baseline_snap_days)
     
     if changes is None:
-        print("Analysis failed - check imagery availability")
+        logger.error("Analysis failed - check imagery availability")
         return
     
     # Extract alerts
-    print("\nExtracting change areas...")
+    logger.info("Extracting change areas...")
     alerts = extract_change_areas(changes, region)
     
-    print(f"\n✓ Found {len(alerts)} significant changes")
+    logger.info("✓ Found %d significant changes", len(alerts))
     
     # Create output directory
     OUTPUT_DIR.mkdir(exist_ok=True)
@@ -394,22 +875,19 @@ def run_analysis(boundary_file=None):
     export_alerts_json(alerts, OUTPUT_DIR / 'alerts.json')
     
     # Print summary
-    print("\n" + "=" * 50)
-    print("ANALYSIS COMPLETE")
-    print("=" * 50)
+    logger.info("ANALYSIS COMPLETE")
     
-    high_priority = [a for a in alerts if a['severity'] == 'high']
-    medium_priority = [a for a in alerts if a['severity'] == 'medium']
-    recovery = [a for a in alerts if a['severity'] == 'positive']
+    # Single pass over alerts for the per-severity counts
+    severity_counts = Counter(alert.severity for alert in alerts)
     
-    print(f"  🔴 High priority:   {len(high_priority)}")
-    print(f"  🟡 Medium priority: {len(medium_priority)}")
-    print(f"  🟢 Recovery areas:  {len(recovery)}")
+    logger.info("  🔴 High priority:   %d", severity_counts['high'])
+    logger.info("  🟡 Medium priority: %d", severity_counts['medium'])
+    logger.info("  🟢 Recovery areas:  %d", severity_counts['positive'])
     
     if alerts:
-        print("\nTop alerts:")
-        for alert in sorted(alerts, key=lambda x: x['area_acres'], reverse=True)[:5]:
-            print(f"  • {alert['type']}: {alert['area_acres']} acres at ({alert['lat']:.4f}, {alert['lng']:.4f})")
+        logger.info("Top alerts:")
+        for alert in heapq.nlargest(5, alerts, key=attrgetter('area_acres')):
+            logger.info("  • %s: %s acres at (%.4f, %.4f)", alert.type, alert.area_acres, alert.lat, alert.lng)
     
     return alerts
 
@@ -429,9 +907,9 @@ def schedule_regular_analysis():
     
     Sentinel-2 revisit time is ~5 days, so run every 5-7 days.
     """
-    print("For scheduled runs, set up a cron job:")
-    print("  0 6 */5 * * python satellite_processor.py")
-    print("  (Runs every 5 days at 6 AM)")
+    logger.info("For scheduled runs, set up a cron job:")
+    logger.info("  0 6 */5 * * python satellite_processor.py")
+    logger.info("  (Runs every 5 days at 6 AM)")
 
 
 # ================================================
@@ -441,14 +919,17 @@ def schedule_regular_analysis():
 if __name__ == '__main__':
     import sys
     
+    # Plain messages on stdout; use level=logging.DEBUG for per-alert traces
+    logging.basicConfig(stream=sys.stdout, level=logging.INFO, format='%(message)s')
+    
     # Check for boundary file argument
     boundary_file = sys.argv[1] if len(sys.argv) > 1 else None
     
     if boundary_file:
-        print(f"Using boundary file: {boundary_file}")
+        logger.info("Using boundary file: %s", boundary_file)
     else:
-        print("No boundary file provided - using bounding box approximation")
-        print("Usage: python satellite_processor.py [boundary.geojson]")
+        logger.info("No boundary file provided - using bounding box approximation")
+        logger.info("Usage: python satellite_processor.py [boundary.geojson]")
     
     # Run analysis
     alerts = run_analysis(boundary_file)
@@ -15,7 +15,8 @@ def test_connection():
     # Initialize Earth Engine
     print("\n1. Testing Earth Engine connection...")
     try:
-        ee.Initialize(project='red-lake-forest-watch')
+        ee.Initialize(project='red-lake-forest-watch',
+                      url='https://earthengine-highvolume.googleapis.com')
         print("   ✓ Connected to Earth Engine")
     except Exception as e:
         print(f"   ✗ Connection failed: {e}")